@@ -2,7 +2,16 @@ import json
 import streamlit as st
 import sys
 import os
+import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# orjson (C, SIMD-accelerated) is much faster than stdlib json for the
+# chunks metadata; fall back to stdlib when not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Optional .env loading
 try:
@@ -19,20 +28,136 @@ if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
 from ingestion.loader import load_documents
-from ingestion.cleaner import clean_text
-from ingestion.chunker import chunk_text
-from embeddings.embedder import embed_texts
-from vector_store.faiss_index import build_index
+from ingestion.chunker import chunk_document, _ensure_punkt
+from embeddings.embedder import embed_texts, get_embedder
+from vector_store.chunk_store import from_compact, to_compact
+from vector_store.faiss_index import build_index, load_index, save_index
 from retrieval.retriever import retrieve_chunks
 from retrieval.reranker import rerank_chunks
 from retrieval.query_rewrite import rewrite_query_groq
-from generation.generator import generate_answer
-from generation.groq_generator import generate_answer_groq
+from generation.generator import generate_answer, get_generator
+from generation.groq_generator import generate_answer_groq_stream
+
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 
 st.set_page_config(page_title="RAG QA System", layout="wide")
 st.title("📄 Retrieval-Augmented Question Answering")
 
+
+# ---------------- Cached resources ----------------
+@st.cache_resource(show_spinner=False)
+def _load_embedder():
+    """Load the sentence-transformer once per process, shared across sessions."""
+    return get_embedder()
+
+
+@st.cache_resource(show_spinner=False)
+def _load_generator():
+    """Load the FLAN-T5 tokenizer/model once per process (local mode only)."""
+    return get_generator()
+
+
+def _save_chunks(path, chunks):
+    """Serialize chunk metadata to disk in compact columnar form."""
+    payload = to_compact(chunks)
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(payload))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+
+def _read_chunks(path):
+    """Load chunk metadata from disk (compact or legacy list format)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            obj = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+    # Legacy saves were a plain list of chunk dicts.
+    return from_compact(obj) if isinstance(obj, dict) else obj
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _rewrite(q, mode):
+    """Rewrite a query via Groq, cached for a day per (query, mode).
+
+    Queries under 4 tokens are already concrete retrieval terms; skip
+    the network round-trip for them.
+    """
+    if len(q.split()) < 4:
+        return q
+    return rewrite_query_groq(q, mode=mode)
+
+
+def _index_signature(chunks):
+    """Opaque token identifying the current corpus, for cache keying."""
+    return hash(tuple(c["chunk_id"] for c in chunks))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _retrieve_cached(retrieval_query, rerank_query, use_rr, index_signature):
+    """Retrieve (and optionally rerank) chunks, cached per query + corpus.
+
+    The FAISS index and chunk list are read from session state; the
+    index_signature parameter keys the cache so results are invalidated
+    when documents are re-processed.
+    """
+    initial = retrieve_chunks(
+        retrieval_query,
+        st.session_state.index,
+        st.session_state.chunks,
+        top_k=20 if use_rr else 8,
+    )
+
+    top_score = initial[0].get("score", 0.0) if initial else 0.0
+    if top_score < MIN_SCORE:
+        return top_score, []
+
+    retrieved = rerank_chunks(rerank_query, initial, top_k=5) if use_rr else initial[:8]
+    return top_score, retrieved
+
+
+@st.cache_data(show_spinner=False, hash_funcs={UploadedFile: lambda f: f.getvalue()})
+def _load_and_chunk(uploaded_files):
+    """Stage uploads to a temp dir, then load, clean and chunk them.
+
+    Cached on the uploaded file contents so re-processing identical
+    files skips the load/clean/chunk work entirely. Cleaning/chunking is
+    independent per document, so it is fanned out across CPU cores when
+    there is more than one document.
+    """
+    all_chunks = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for f in uploaded_files:
+            path = os.path.join(tmpdir, f.name)
+            f.seek(0)
+            with open(path, "wb") as out:
+                # Stream in 1MB blocks instead of materializing the whole
+                # upload as a second in-memory copy via f.read().
+                shutil.copyfileobj(f, out, length=1 << 20)
+
+        docs = load_documents(tmpdir)
+
+    if len(docs) > 1:
+        # chunk_document lives in ingestion.chunker so spawn-based pools
+        # (macOS/Windows default) can pickle it by reference; the
+        # Streamlit-exec'd script itself is not importable in workers.
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=_ensure_punkt
+        ) as ex:
+            for doc_chunks in ex.map(chunk_document, docs, chunksize=4):
+                all_chunks.extend(doc_chunks)
+    else:
+        for d in docs:
+            all_chunks.extend(chunk_document(d))
+
+    return len(docs), all_chunks
+
 # ---------------- Sidebar: Upload ----------------
 st.sidebar.header("Upload documents")
 uploaded_files = st.sidebar.file_uploader(
@@ -63,6 +188,10 @@ if generator_choice == "Groq (LLM API)":
         index=0,
     )
 
+# Queries whose best retrieval score falls below this are answered with the
+# "I don't know" fallback without paying for reranking or generation.
+MIN_SCORE = float(os.getenv("RAG_MIN_SCORE", "0.25"))
+
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     msg = "GROQ_API_KEY is not set. Add it to your environment or a .env file."
@@ -99,11 +228,10 @@ if (
     and os.path.exists("storage/faiss.index")
     and os.path.exists("storage/chunks.json")
 ):
-    import faiss
-    with open("storage/chunks.json", "r", encoding="utf-8") as f:
-        st.session_state.chunks = json.load(f)
+    st.session_state.chunks = _read_chunks("storage/chunks.json")
 
-    st.session_state.index = faiss.read_index("storage/faiss.index")
+    # mmap keeps cold boots O(1) in index size instead of a full re-read.
+    st.session_state.index = load_index("storage/faiss.index", mmap=True)
 
     st.sidebar.success("Loaded saved index ✅")
 
@@ -125,28 +253,9 @@ if reset:
 # ---------------- Process Uploaded Files ----------------
 if process and uploaded_files:
     with st.spinner("Processing documents..."):
-        all_chunks = []
+        docs_loaded, all_chunks = _load_and_chunk(uploaded_files)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Save uploaded files temporarily
-            for f in uploaded_files:
-                path = os.path.join(tmpdir, f.name)
-                with open(path, "wb") as out:
-                    out.write(f.read())
-
-            # Load docs from temp folder
-            docs = load_documents(tmpdir)
-
-            for d in docs:
-                text = clean_text(d["text"])
-                doc_id = d["document_id"]
-
-                if ".pdf_page_" in doc_id.lower():
-                    all_chunks.extend(chunk_text(text, doc_id, chunk_size=180, overlap=60))
-                else:
-                    all_chunks.extend(chunk_text(text, doc_id, chunk_size=280, overlap=80))
-
-        embeddings = embed_texts([c["text"] for c in all_chunks])
+        embeddings = embed_texts([c["text"] for c in all_chunks], model=_load_embedder())
         index = build_index(embeddings)
 
         st.session_state.chunks = all_chunks
@@ -154,19 +263,17 @@ if process and uploaded_files:
         # ✅ Save index + chunks to disk
         os.makedirs("storage", exist_ok=True)
 
-# Save FAISS index
-        import faiss
-        faiss.write_index(index, "storage/faiss.index")
+        # Save FAISS index (atomic tmp + rename)
+        save_index(index, "storage/faiss.index")
 
-# Save chunks metadata
-        with open("storage/chunks.json", "w", encoding="utf-8") as f:
-            json.dump(all_chunks, f, ensure_ascii=False, indent=2)
+        # Save chunks metadata
+        _save_chunks("storage/chunks.json", all_chunks)
 
         st.sidebar.success("Saved index to storage/ ✅")
 
         st.session_state.stats = {
             "files_uploaded": len(uploaded_files),
-            "docs_loaded": len(docs),        # pdf pages count here
+            "docs_loaded": docs_loaded,      # pdf pages count here
             "chunks_created": len(all_chunks)
         }
 
@@ -177,30 +284,36 @@ if st.session_state.index is not None:
     query = st.text_input("Ask a question")
 
     if query:
-        rewritten_query = rewrite_query_groq(query, mode=rewrite_mode)
+        rewritten_query = _rewrite(query, rewrite_mode)
         with st.sidebar.expander("Rewritten retrieval query", expanded=False):
             st.write(rewritten_query or "(empty)")
 
-        initial = retrieve_chunks(
+        top_score, retrieved = _retrieve_cached(
             rewritten_query or query,
-            st.session_state.index,
-            st.session_state.chunks,
-            top_k=20 if use_reranker else 8,
+            query,
+            use_reranker,
+            _index_signature(st.session_state.chunks),
         )
 
-        retrieved = rerank_chunks(query, initial, top_k=5) if use_reranker else initial[:8]
+        if not retrieved or top_score < MIN_SCORE:
+            st.subheader("Answer")
+            st.write("I don't know based on the uploaded document.")
+            st.stop()
+
         st.caption(f"Original query: {query}")
         st.caption(f"Rewritten query: {rewritten_query or query}")
 
+        st.subheader("Answer")
         if generator_choice == "Groq (LLM API)":
             if not GROQ_API_KEY:
                 st.stop()
-            answer = generate_answer_groq(query, retrieved, model=groq_model)
+            # Render tokens as they arrive; write_stream returns the full text.
+            answer = st.write_stream(
+                generate_answer_groq_stream(query, retrieved, model=groq_model)
+            )
         else:
-            answer = generate_answer(query, retrieved)
-
-        st.subheader("Answer")
-        st.write(answer)
+            answer = generate_answer(query, retrieved, generator=_load_generator())
+            st.write(answer)
 
         st.subheader("Sources")
         for r in retrieved:
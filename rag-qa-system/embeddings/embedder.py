@@ -1,86 +1,17 @@
 """
 Embedding utilities for the RAG QA system.
 
-Provides a lazily loaded sentence-transformer model (CPU-only) and a
-batch embedding function that returns NumPy arrays.
-"""
-from typing import List
-
-import numpy as np
-
-_EMBEDDER = None  # Lazy-loaded SentenceTransformer instance
-
-
-def get_embedder():
-	"""Return a lazily loaded sentence-transformer model on CPU.
-
-	Model: `sentence-transformers/all-MiniLM-L6-v2`
-
-	Returns
-	-------
-	SentenceTransformer
-		Loaded embedding model instance (cached after first call).
-	"""
-	global _EMBEDDER
-	if _EMBEDDER is None:
-		from sentence_transformers import SentenceTransformer
-		_EMBEDDER = SentenceTransformer(
-			"sentence-transformers/all-MiniLM-L6-v2", device="cpu"
-		)
-	return _EMBEDDER
-
-
-def embed_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
-	"""Embed a list of text strings into dense vectors.
-
-	Parameters
-	----------
-	texts : List[str]
-		List of text chunks to embed.
-	batch_size : int, optional
-		Batch size for encoding, by default 32.
-
-	Returns
-	-------
-	numpy.ndarray
-		2D array of shape (N, D) with dtype float32, where N is len(texts)
-		and D is the embedding dimension.
-
-	Notes
-	-----
-	- Uses CPU-only inference.
-	- Returns an empty array with shape (0, D) when `texts` is empty.
-	"""
-	model = get_embedder()
-
-	if not texts:
-		dim = getattr(model, "get_sentence_embedding_dimension", lambda: 0)()
-		return np.zeros((0, dim), dtype=np.float32)
-
-	vectors = model.encode(
-		texts,
-		batch_size=batch_size,
-		show_progress_bar=False,
-		convert_to_numpy=True,
-		normalize_embeddings=False,
-	)
-
-	# Ensure float32 for consistency
-	if vectors.dtype != np.float32:
-		vectors = vectors.astype(np.float32)
-
-	return vectors
-
-"""
-Embedding utilities for the RAG QA system.
-
-Provides lazily-loaded sentence-transformer model (CPU-only) and a helper
+Provides a lazily-loaded sentence-transformer model (CPU-only) and a helper
 to embed batches of texts as a 2D NumPy array.
 """
 from typing import List, Optional
+import os
 
 import numpy as np
 
+from embeddings import onnx_embedder, remote_embedder
+from embeddings.normalize import l2_normalize
+
 try:
 	from sentence_transformers import SentenceTransformer
 except Exception as e:  # pragma: no cover
@@ -90,33 +21,64 @@ except Exception as e:  # pragma: no cover
 _EMBEDDER: Optional["SentenceTransformer"] = None
 _MODEL_NAME: str = "all-MiniLM-L6-v2"
 
+# Multi-process encoding pays ~2s of pool spin-up, so it only kicks in for
+# large corpora; the pool is kept for reuse across ingest calls.
+_MULTI_PROCESS_MIN_TEXTS = 1000
+_ENCODE_POOL = None
+
+
+def _get_encode_pool(model):
+	"""Start (once) and return a multi-process encode pool, or None.
+
+	Only real SentenceTransformer models support worker pools; the ONNX
+	wrapper and single-core machines fall back to in-process encoding.
+	"""
+	global _ENCODE_POOL
+	if _ENCODE_POOL is None and hasattr(model, "start_multi_process_pool"):
+		workers = min(4, (os.cpu_count() or 2) // 2)
+		if workers > 1:
+			_ENCODE_POOL = model.start_multi_process_pool(
+				target_devices=["cpu"] * workers
+			)
+	return _ENCODE_POOL
+
 
 def get_embedder() -> "SentenceTransformer":
 	"""Return a lazily-initialized sentence-transformer embedder (CPU-only).
 
-	Loads the model only once and reuses it for subsequent calls.
+	Loads the model only once and reuses it for subsequent calls. When
+	`optimum[onnxruntime]` is installed, an INT8-quantized ONNX version of
+	the model (see `embeddings.onnx_embedder`) is used instead of PyTorch
+	FP32 — same `encode` interface, faster CPU inference.
 
 	Returns
 	-------
 	SentenceTransformer
-		The loaded sentence-transformer model.
+		The loaded embedding model (an `OnnxEmbedder` when the ONNX path
+		is available).
 
 	Raises
 	------
 	ImportError
-		If `sentence-transformers` is not installed.
+		If neither the ONNX path nor `sentence-transformers` is available.
 	"""
 	global _EMBEDDER
-	if SentenceTransformer is None:
-		raise ImportError(
-			"sentence-transformers is required. Install with 'pip install sentence-transformers'."
-		)
 	if _EMBEDDER is None:
+		_EMBEDDER = onnx_embedder.load_onnx_embedder()
+	if _EMBEDDER is None:
+		if SentenceTransformer is None:
+			raise ImportError(
+				"sentence-transformers is required. Install with 'pip install sentence-transformers'."
+			)
 		_EMBEDDER = SentenceTransformer(_MODEL_NAME, device="cpu")
 	return _EMBEDDER
 
 
-def embed_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
+def embed_texts(
+	texts: List[str],
+	batch_size: int = 32,
+	model: Optional["SentenceTransformer"] = None,
+) -> np.ndarray:
 	"""Embed a list of texts into dense vectors using the embedder.
 
 	Parameters
@@ -125,27 +87,111 @@ def embed_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
 		Input text strings to embed.
 	batch_size : int, optional
 		Batch size for model encoding,  default 32.
+	model : SentenceTransformer, optional
+		Pre-loaded embedding model to use; falls back to `get_embedder()`.
 
 	Returns
 	-------
 	np.ndarray
 		A 2D NumPy array of shape (N, D) where N is the number of inputs
-		and D is the embedding dimension.
+		and D is the embedding dimension. Rows are L2-normalized so inner
+		product equals cosine similarity.
+
+	Notes
+	-----
+	When `EMBED_SERVER_URL` is set, embedding is delegated to the remote
+	service (see `embeddings.remote_embedder`) instead of the in-process
+	model.
 	"""
-	model = get_embedder()
+	if texts and remote_embedder.get_server_url() is not None:
+		return remote_embedder.embed_texts_remote(texts)
+
+	if model is None:
+		model = get_embedder()
 	if not texts:
 		dim = model.get_sentence_embedding_dimension()
 		return np.zeros((0, dim), dtype=np.float32)
 
-	vectors: np.ndarray = model.encode(
-		texts,
-		batch_size=batch_size,
-		device="cpu",
-		convert_to_numpy=True,
-		show_progress_bar=False,
+	# Deduplicate identical inputs (PDF headers/footers produce repeated
+	# chunks): each unique string goes through the encoder once, then
+	# results are scattered back to the original positions.
+	seen: dict = {}
+	unique_texts: List[str] = []
+	mapping = np.empty(len(texts), dtype=np.int64)
+	for i, t in enumerate(texts):
+		j = seen.get(t)
+		if j is None:
+			j = len(unique_texts)
+			seen[t] = j
+			unique_texts.append(t)
+		mapping[i] = j
+
+	pool = (
+		_get_encode_pool(model)
+		if len(unique_texts) >= _MULTI_PROCESS_MIN_TEXTS
+		else None
 	)
+	if pool is not None:
+		vectors = model.encode_multi_process(
+			unique_texts, pool, batch_size=64, chunk_size=1000
+		)
+		# Normalize here: encode_multi_process does not take the flag on
+		# all sentence-transformers versions.
+		vectors = l2_normalize(vectors)
+	else:
+		vectors = model.encode(
+			unique_texts,
+			batch_size=batch_size,
+			device="cpu",
+			convert_to_numpy=True,
+			show_progress_bar=False,
+			normalize_embeddings=True,
+		)
+	if len(unique_texts) != len(texts):
+		vectors = vectors[mapping]
 	# Ensure float32 for compatibility with FAISS
 	if vectors.dtype != np.float32:
 		vectors = vectors.astype(np.float32, copy=False)
 	return vectors
 
+
+def iter_embed_texts(
+	texts: List[str],
+	batch_size: int = 256,
+	model: Optional["SentenceTransformer"] = None,
+):
+	"""Yield L2-normalized embedding batches instead of one full matrix.
+
+	Streaming companion to `embed_texts` for index building: only one
+	batch of vectors is alive at a time, so peak memory during ingestion
+	is O(batch) rather than O(corpus).
+
+	Parameters
+	----------
+	texts : List[str]
+		Input text strings to embed.
+	batch_size : int, optional
+		Number of texts per yielded batch, by default 256.
+	model : SentenceTransformer, optional
+		Pre-loaded embedding model to use; falls back to `get_embedder()`.
+
+	Yields
+	------
+	np.ndarray
+		2D float32 arrays of shape (<=batch_size, D) with L2-normalized
+		rows, in input order.
+	"""
+	if model is None:
+		model = get_embedder()
+	for start in range(0, len(texts), batch_size):
+		vectors = model.encode(
+			texts[start:start + batch_size],
+			batch_size=32,
+			device="cpu",
+			convert_to_numpy=True,
+			show_progress_bar=False,
+			normalize_embeddings=True,
+		)
+		if vectors.dtype != np.float32:
+			vectors = vectors.astype(np.float32, copy=False)
+		yield vectors
@@ -0,0 +1,59 @@
+"""
+Row-wise L2 normalization shared by the embedding backends.
+
+Every embedding path that cannot rely on the model normalizing for it
+(multi-process encoding, the ONNX wrapper, remote servers) funnels
+through `l2_normalize`. With numba installed, a fused parallel kernel
+normalizes in a single pass over the data; otherwise a NumPy fallback
+makes separate norm/maximum/divide passes.
+"""
+import numpy as np
+
+try:
+	from numba import njit, prange
+except Exception:  # pragma: no cover - optional dependency
+	njit = None  # type: ignore
+
+
+if njit is not None:
+	@njit(parallel=True, fastmath=True, cache=True)
+	def _l2_norm_rows(x, eps):
+		# Fused single pass: accumulate the squared norm and scale each row
+		# in place of the norm/maximum/divide intermediate arrays.
+		out = np.empty_like(x)
+		for i in prange(x.shape[0]):
+			s = 0.0
+			for j in range(x.shape[1]):
+				s += x[i, j] * x[i, j]
+			inv = 1.0 / max(np.sqrt(s), eps)
+			for j in range(x.shape[1]):
+				out[i, j] = x[i, j] * inv
+		return out
+
+
+def l2_normalize(x: np.ndarray, eps: float = 1e-12) -> np.ndarray:
+	"""L2-normalize rows of a 2D array, safely handling zeros.
+
+	Uses the fused Numba kernel (one pass over the data, parallel across
+	rows) when numba is installed. The first jitted call pays compilation
+	cost, after which the kernel comes from the on-disk cache.
+
+	Parameters
+	----------
+	x : np.ndarray
+		2D float array; a 1D input is treated as a single row.
+	eps : float, optional
+		Lower bound on row norms to avoid division by zero.
+
+	Returns
+	-------
+	np.ndarray
+		Array of the same shape with unit-length rows.
+	"""
+	if x.ndim == 1:
+		x = x.reshape(1, -1)
+	if njit is not None:
+		return _l2_norm_rows(np.ascontiguousarray(x), eps)
+	norms = np.linalg.norm(x, axis=1, keepdims=True)
+	norms = np.maximum(norms, eps)
+	return x / norms
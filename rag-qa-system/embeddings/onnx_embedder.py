@@ -0,0 +1,142 @@
+"""
+ONNX Runtime INT8 embedder for the RAG QA system (CPU-only).
+
+Exports `all-MiniLM-L6-v2` to ONNX via optimum, applies dynamic INT8
+quantization, and wraps the resulting session in a minimal
+SentenceTransformer-compatible class (`encode` +
+`get_sentence_embedding_dimension`). Mean pooling and L2 normalization
+are done in NumPy. The quantized model is cached on disk under
+`storage/onnx-minilm-int8/` so export runs only once.
+"""
+from typing import List, Optional
+import os
+
+import numpy as np
+
+from embeddings.normalize import l2_normalize
+
+try:
+	from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+	from optimum.onnxruntime.configuration import AutoQuantizationConfig
+except Exception:  # pragma: no cover - optional dependency
+	ORTModelForFeatureExtraction = None  # type: ignore
+
+
+_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+_ONNX_DIR = os.path.join("storage", "onnx-minilm-int8")
+_MAX_SEQ_LENGTH = 256
+
+
+class OnnxEmbedder:
+	"""SentenceTransformer-compatible wrapper around an INT8 ONNX session.
+
+	Only the pieces of the SentenceTransformer API used by this project
+	are implemented: `encode` (with `normalize_embeddings` support) and
+	`get_sentence_embedding_dimension`.
+	"""
+
+	def __init__(self, session, tokenizer, dim: int):
+		self._session = session
+		self._tokenizer = tokenizer
+		self._dim = dim
+		self._input_names = {i.name for i in session.get_inputs()}
+
+	def get_sentence_embedding_dimension(self) -> int:
+		return self._dim
+
+	def _forward(self, batch: List[str]) -> np.ndarray:
+		enc = self._tokenizer(
+			batch,
+			padding=True,
+			truncation=True,
+			max_length=_MAX_SEQ_LENGTH,
+			return_tensors="np",
+		)
+		feeds = {
+			k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names
+		}
+		last_hidden = self._session.run(None, feeds)[0]
+
+		# Masked mean pooling over the sequence dimension.
+		mask = enc["attention_mask"][..., None].astype(np.float32)
+		summed = (last_hidden * mask).sum(axis=1)
+		counts = np.maximum(mask.sum(axis=1), 1e-9)
+		return summed / counts
+
+	def encode(
+		self,
+		sentences: List[str],
+		batch_size: int = 32,
+		convert_to_numpy: bool = True,
+		show_progress_bar: bool = False,
+		normalize_embeddings: bool = True,
+		**kwargs,
+	) -> np.ndarray:
+		if not sentences:
+			return np.zeros((0, self._dim), dtype=np.float32)
+
+		parts = [
+			self._forward(sentences[i:i + batch_size])
+			for i in range(0, len(sentences), batch_size)
+		]
+		vectors = np.vstack(parts).astype(np.float32, copy=False)
+
+		if normalize_embeddings:
+			vectors = l2_normalize(vectors)
+		return vectors
+
+
+def load_onnx_embedder() -> Optional[OnnxEmbedder]:
+	"""Load (exporting + quantizing on first use) the INT8 ONNX embedder.
+
+	Returns
+	-------
+	OnnxEmbedder or None
+		The wrapped quantized model, or None when optimum/onnxruntime are
+		unavailable or export fails (callers fall back to PyTorch).
+	"""
+	if ORTModelForFeatureExtraction is None:
+		return None
+	try:
+		import onnxruntime as ort
+		from transformers import AutoTokenizer
+
+		if not os.path.isdir(_ONNX_DIR):
+			export_dir = _ONNX_DIR + ".export"
+			exported = ORTModelForFeatureExtraction.from_pretrained(
+				_MODEL_NAME, export=True, provider="CPUExecutionProvider"
+			)
+			exported.save_pretrained(export_dir)
+
+			quantizer = ORTQuantizer.from_pretrained(export_dir)
+			quantizer.quantize(
+				save_dir=_ONNX_DIR,
+				quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False),
+			)
+
+		model_path = None
+		for name in sorted(os.listdir(_ONNX_DIR)):
+			if name.endswith(".onnx"):
+				model_path = os.path.join(_ONNX_DIR, name)
+				break
+		if model_path is None:
+			return None
+
+		session_options = ort.SessionOptions()
+		session_options.intra_op_num_threads = os.cpu_count() or 1
+		session_options.graph_optimization_level = (
+			ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+		)
+		session = ort.InferenceSession(
+			model_path,
+			sess_options=session_options,
+			providers=["CPUExecutionProvider"],
+		)
+		tokenizer = AutoTokenizer.from_pretrained(_MODEL_NAME, use_fast=True)
+
+		dim = session.get_outputs()[0].shape[-1]
+		if not isinstance(dim, int):
+			dim = 384  # MiniLM-L6 hidden size; shape can be symbolic
+		return OnnxEmbedder(session, tokenizer, dim)
+	except Exception:
+		return None
@@ -0,0 +1,98 @@
+"""
+Remote embedding client for the RAG QA system.
+
+Talks to a TextEmbed/TEI-style HTTP embedding service (`POST <url>` with
+`{"texts": [...]}`) so the transformer forward pass runs in a dedicated
+inference server instead of the app process. Batches are sent
+concurrently via asyncio so many small requests overlap on the wire.
+
+Enable by setting the `EMBED_SERVER_URL` environment variable (e.g.
+`http://localhost:8080/embed`); when unset, `embeddings.embedder`
+falls back to the local sentence-transformer.
+"""
+from typing import List, Optional
+import asyncio
+import os
+
+import numpy as np
+
+from embeddings.normalize import l2_normalize
+
+try:
+	import httpx
+except Exception:  # pragma: no cover - optional dependency
+	httpx = None  # type: ignore
+
+
+_BATCH_SIZE = 128
+_TIMEOUT_S = 60.0
+
+
+def get_server_url() -> Optional[str]:
+	"""Return the configured embedding server URL, or None when unset."""
+	return os.getenv("EMBED_SERVER_URL") or None
+
+
+def _parse_embeddings(payload) -> List[List[float]]:
+	"""Extract the embedding matrix from a server response body."""
+	if isinstance(payload, dict):
+		for key in ("embeddings", "data"):
+			if key in payload:
+				return payload[key]
+		raise ValueError(f"Unexpected embedding response keys: {list(payload)}")
+	return payload
+
+
+async def _embed_all(url: str, batches: List[List[str]]) -> List[List[List[float]]]:
+	"""POST all batches concurrently and return their embeddings in order."""
+	async with httpx.AsyncClient(timeout=_TIMEOUT_S) as client:
+
+		async def post(batch: List[str]):
+			resp = await client.post(url, json={"texts": batch})
+			resp.raise_for_status()
+			return _parse_embeddings(resp.json())
+
+		return await asyncio.gather(*(post(b) for b in batches))
+
+
+def embed_texts_remote(texts: List[str], batch_size: int = _BATCH_SIZE) -> np.ndarray:
+	"""Embed texts via the remote embedding service.
+
+	Parameters
+	----------
+	texts : List[str]
+		Input text strings to embed.
+	batch_size : int, optional
+		Number of texts per HTTP request, by default 128.
+
+	Returns
+	-------
+	np.ndarray
+		2D float32 array of shape (N, D), rows L2-normalized, in input
+		order.
+
+	Raises
+	------
+	RuntimeError
+		If `EMBED_SERVER_URL` is unset or `httpx` is not installed.
+	"""
+	url = get_server_url()
+	if url is None:
+		raise RuntimeError("EMBED_SERVER_URL is not set.")
+	if httpx is None:
+		raise RuntimeError(
+			"httpx is required for remote embedding. Install with 'pip install httpx'."
+		)
+	if not texts:
+		return np.zeros((0, 0), dtype=np.float32)
+
+	batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+	results = asyncio.run(_embed_all(url, batches))
+
+	vectors = np.asarray(
+		[row for batch in results for row in batch], dtype=np.float32
+	)
+	# Not every embedding server normalizes its output, but unit rows are
+	# part of the embed_texts contract (downstream inner product == cosine,
+	# and the retriever skips query-side normalization on that basis).
+	return l2_normalize(vectors)
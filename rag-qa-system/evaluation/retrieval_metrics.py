@@ -1,4 +1,6 @@
-from typing import List, Set
+from typing import List, Sequence, Set
+
+import numpy as np
 
 
 def precision_at_k(retrieved_ids: List[str], relevant_ids: Set[str], k: int) -> float:
@@ -10,7 +12,8 @@ def precision_at_k(retrieved_ids: List[str], relevant_ids: Set[str], k: int) ->
     top_k = retrieved_ids[:k]
     if not top_k:
         return 0.0
-    hits = sum(1 for rid in top_k if rid in relevant_ids)
+    # Single hash-table intersection instead of a per-id Python loop.
+    hits = len(relevant_ids.intersection(top_k))
     return hits / k
 
 
@@ -20,6 +23,45 @@ def recall_at_k(retrieved_ids: List[str], relevant_ids: Set[str], k: int) -> flo
     """
     if not relevant_ids:
         return 0.0
-    top_k = retrieved_ids[:k]
-    hits = sum(1 for rid in top_k if rid in relevant_ids)
+    hits = len(relevant_ids.intersection(retrieved_ids[:k]))
     return hits / len(relevant_ids)
+
+
+def precision_at_k_batch(
+    retrieved: Sequence[Sequence[str]], relevant: List[Set[str]], k: int
+) -> np.ndarray:
+    """
+    Precision@k for many queries at once; returns an array of shape (Q,).
+
+    `retrieved[q]` is the ranked id list for query q and `relevant[q]`
+    the matching relevant-id set. Membership tests run through np.isin
+    per query instead of Python-level loops.
+    """
+    out = np.zeros(len(retrieved), dtype=np.float64)
+    if k <= 0:
+        return out
+    for q, (ids, rel) in enumerate(zip(retrieved, relevant)):
+        top_k = np.asarray(list(ids[:k]), dtype=object)
+        if top_k.size == 0 or not rel:
+            continue
+        rel_arr = np.asarray(list(rel), dtype=object)
+        out[q] = np.isin(top_k, rel_arr).sum() / k
+    return out
+
+
+def recall_at_k_batch(
+    retrieved: Sequence[Sequence[str]], relevant: List[Set[str]], k: int
+) -> np.ndarray:
+    """
+    Recall@k for many queries at once; returns an array of shape (Q,).
+    """
+    out = np.zeros(len(retrieved), dtype=np.float64)
+    for q, (ids, rel) in enumerate(zip(retrieved, relevant)):
+        if not rel:
+            continue
+        top_k = np.asarray(list(ids[:k]), dtype=object)
+        if top_k.size == 0:
+            continue
+        rel_arr = np.asarray(list(rel), dtype=object)
+        out[q] = np.isin(top_k, rel_arr).sum() / len(rel)
+    return out
@@ -5,34 +5,103 @@ Uses the `google/flan-t5-small` model locally on CPU to generate answers
 based on retrieved context chunks.
 """
 from typing import Dict, List, Tuple, Optional
+import os
 
 import torch
 from transformers import T5Tokenizer, T5ForConditionalGeneration
 
+try:
+	from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+	from optimum.onnxruntime.configuration import AutoQuantizationConfig
+except Exception:  # pragma: no cover - optional dependency
+	ORTModelForSeq2SeqLM = None  # type: ignore
+
 
 _TOKENIZER: Optional[T5Tokenizer] = None
 _MODEL: Optional[T5ForConditionalGeneration] = None
 _MODEL_NAME = "google/flan-t5-small"
 _DEVICE = torch.device("cpu")
 
+# On-disk cache for the ONNX INT8 export (built on first use).
+_ONNX_DIR = os.path.join("storage", "onnx-flan-t5-int8")
+
+
+def _load_onnx_generator():
+	"""Load (exporting + quantizing on first use) an INT8 ONNX FLAN-T5 model.
+
+	Converts the PyTorch model to ONNX via optimum, applies dynamic INT8
+	quantization, and caches the result under `storage/onnx-flan-t5-int8/`.
+	Subsequent calls load the quantized model directly from disk. The
+	returned model keeps the same `.generate()` interface as the PyTorch
+	version.
+
+	Returns
+	-------
+	ORTModelForSeq2SeqLM or None
+		Quantized ONNX model, or None if export/quantization failed.
+	"""
+	try:
+		import onnxruntime as ort
+
+		session_options = ort.SessionOptions()
+		session_options.intra_op_num_threads = os.cpu_count() or 1
+		session_options.graph_optimization_level = (
+			ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+		)
+
+		if not os.path.isdir(_ONNX_DIR):
+			export_dir = _ONNX_DIR + ".export"
+			exported = ORTModelForSeq2SeqLM.from_pretrained(
+				_MODEL_NAME, export=True, provider="CPUExecutionProvider"
+			)
+			exported.save_pretrained(export_dir)
+
+			qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False)
+			for file_name in (
+				"encoder_model.onnx",
+				"decoder_model.onnx",
+				"decoder_with_past_model.onnx",
+			):
+				quantizer = ORTQuantizer.from_pretrained(
+					export_dir, file_name=file_name
+				)
+				quantizer.quantize(save_dir=_ONNX_DIR, quantization_config=qconfig)
+
+		return ORTModelForSeq2SeqLM.from_pretrained(
+			_ONNX_DIR,
+			provider="CPUExecutionProvider",
+			session_options=session_options,
+		)
+	except Exception:
+		# Export/quantization can fail (old optimum, missing opsets, etc.);
+		# fall back to the PyTorch model rather than breaking generation.
+		return None
+
 
 def get_generator() -> Tuple[T5Tokenizer, T5ForConditionalGeneration]:
 	"""Lazily load and return the FLAN-T5 tokenizer and model (CPU-only).
 
-	The model is set to evaluation mode. Callers should use `torch.no_grad()`
-	during generation to avoid building gradients.
+	When `optimum[onnxruntime]` is installed, an INT8-quantized ONNX
+	version of the model is used instead of PyTorch FP32 — same
+	`.generate()` interface, substantially faster CPU inference. The model
+	is set to evaluation mode. Callers should use `torch.no_grad()` during
+	generation to avoid building gradients.
 
 	Returns
 	-------
 	Tuple[T5Tokenizer, T5ForConditionalGeneration]
-		Tokenizer and model instances.
+		Tokenizer and model instances (the model may be an
+		`ORTModelForSeq2SeqLM` when the ONNX path is available).
 	"""
 	global _TOKENIZER, _MODEL
 	if _TOKENIZER is None or _MODEL is None:
 		_TOKENIZER = T5Tokenizer.from_pretrained(_MODEL_NAME,legacy=True)
-		_MODEL = T5ForConditionalGeneration.from_pretrained(_MODEL_NAME)
-		_MODEL.to(_DEVICE)
-		_MODEL.eval()
+		if ORTModelForSeq2SeqLM is not None:
+			_MODEL = _load_onnx_generator()
+		if _MODEL is None:
+			_MODEL = T5ForConditionalGeneration.from_pretrained(_MODEL_NAME)
+			_MODEL.to(_DEVICE)
+			_MODEL.eval()
 	return _TOKENIZER, _MODEL
 
 
@@ -52,6 +121,12 @@ def build_context(chunks: List[Dict[str, str]], max_tokens: int = 512) -> str:
 	-------
 	str
 		Concatenated context string respecting the token cap.
+
+	Notes
+	-----
+	Chunks produced by `ingestion.chunker.chunk_text` carry a cached
+	"n_tokens" count, so fully-fitting chunks are appended without
+	re-splitting their text; only a truncated final chunk is split.
 	"""
 	if max_tokens <= 0:
 		return ""
@@ -62,18 +137,18 @@ def build_context(chunks: List[Dict[str, str]], max_tokens: int = 512) -> str:
 		t = (ch.get("text", "") or "").strip()
 		if not t:
 			continue
-		toks = t.split()
-		if not toks:
+		n = ch.get("n_tokens") or len(t.split())
+		if not n:
 			continue
 		remaining = max_tokens - token_count
 		if remaining <= 0:
 			break
-		if len(toks) <= remaining:
+		if n <= remaining:
 			parts.append(t)
-			token_count += len(toks)
+			token_count += n
 		else:
 			# Truncate to fit remaining tokens
-			parts.append(" ".join(toks[:remaining]))
+			parts.append(" ".join(t.split()[:remaining]))
 			token_count += remaining
 			break
 
@@ -85,6 +160,7 @@ def generate_answer(
 	chunks: List[Dict[str, str]],
 	max_context_tokens: int = 512,
 	max_new_tokens: int = 128,
+	generator: Optional[Tuple[T5Tokenizer, T5ForConditionalGeneration]] = None,
 ) -> str:
 	"""Generate an answer for a question using retrieved context and FLAN-T5.
 
@@ -98,6 +174,8 @@ def generate_answer(
 		Approximate max context token budget (whitespace tokens), by default 512.
 	max_new_tokens : int, optional
 		Maximum tokens to generate, by default 128.
+	generator : Tuple[T5Tokenizer, T5ForConditionalGeneration], optional
+		Pre-loaded tokenizer/model pair; falls back to `get_generator()`.
 
 	Returns
 	-------
@@ -107,7 +185,7 @@ def generate_answer(
 	if not question or not question.strip():
 		return ""
 
-	tokenizer, model = get_generator()
+	tokenizer, model = generator if generator is not None else get_generator()
 
 	context = build_context(chunks, max_tokens=max_context_tokens)
 	prompt = (
@@ -5,6 +5,31 @@ import os
 from groq import Groq
 
 
+# One client per API key, reused across queries so the underlying httpx
+# connection pool (TCP + TLS session) survives between calls.
+_CLIENTS: Dict[str, Groq] = {}
+
+
+def _get_client(api_key: str) -> Groq:
+    """Return a cached Groq client for the given API key."""
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        client = _CLIENTS.setdefault(api_key, Groq(api_key=api_key))
+    return client
+
+
+_SYSTEM_PROMPT = (
+    "You are a concise assistant. Answer using ONLY the provided context. "
+    "Respond in 1 to 3 complete sentences. "
+    "If the context lacks the answer, reply: 'I don't know based on the uploaded document.' "
+    "Do not copy the context verbatim. "
+    "Include citations in the final answer like '(Source: Lec16.pdf_page_4)'. "
+    "Cite the best 1-2 sources max. "
+    "Do not repeat the question. "
+    "Avoid bullet lists unless the user explicitly asks for them."
+)
+
+
 def build_context(chunks: List[Dict[str, str]], max_chars: int = 8000) -> str:
     """Build a context string from retrieved chunks with source metadata.
 
@@ -99,25 +124,14 @@ def generate_answer_groq(
     if len(context.strip()) < 200:
         return "I don't know based on the uploaded document."
 
-    system_prompt = (
-        "You are a concise assistant. Answer using ONLY the provided context. "
-        "Respond in 1 to 3 complete sentences. "
-        "If the context lacks the answer, reply: 'I don't know based on the uploaded document.' "
-        "Do not copy the context verbatim. "
-        "Include citations in the final answer like '(Source: Lec16.pdf_page_4)'. "
-        "Cite the best 1-2 sources max. "
-        "Do not repeat the question. "
-        "Avoid bullet lists unless the user explicitly asks for them."
-    )
-
-    client = Groq(api_key=api_key)
+    client = _get_client(api_key)
 
     try:
         completion = client.chat.completions.create(
             model=model,
             temperature=temperature,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": _SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": f"Context:\n{context}\n\nQuestion:\n{question}",
@@ -130,3 +144,57 @@ def generate_answer_groq(
     message = completion.choices[0].message if completion.choices else None
     answer = getattr(message, "content", "") if message else ""
     return (answer or "").strip()
+
+
+def generate_answer_groq_stream(
+    question: str,
+    chunks: List[Dict[str, str]],
+    model: str = "llama-3.3-70b-versatile",
+    temperature: float = 0.2,
+):
+    """Stream an answer from Groq, yielding text deltas as they arrive.
+
+    Same inputs and fallback semantics as `generate_answer_groq`, but
+    uses the SSE streaming API so the first tokens can be rendered
+    without waiting for the full completion (e.g. via `st.write_stream`).
+
+    Yields
+    ------
+    str
+        Incremental answer fragments (or a single fallback/error string).
+    """
+    if not question or not question.strip():
+        return
+
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        yield "GROQ_API_KEY is not set. Please configure it in your environment."
+        return
+
+    context = build_context(chunks)
+    if len(context.strip()) < 200:
+        yield "I don't know based on the uploaded document."
+        return
+
+    client = _get_client(api_key)
+
+    try:
+        stream = client.chat.completions.create(
+            model=model,
+            temperature=temperature,
+            stream=True,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Context:\n{context}\n\nQuestion:\n{question}",
+                },
+            ],
+        )
+        for part in stream:
+            delta = part.choices[0].delta if part.choices else None
+            content = getattr(delta, "content", None) if delta else None
+            if content:
+                yield content
+    except Exception as exc:  # pragma: no cover - network/SDK errors
+        yield f"Error calling Groq API: {exc}"
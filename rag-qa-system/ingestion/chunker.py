@@ -2,17 +2,42 @@
 Chunking utilities for the RAG QA system.
 
 Provides sentence-aware, overlapping chunks suitable for embedding/retrieval.
-Uses NLTK sentence tokenizer; callers should ensure NLTK's 'punkt' resource
-is available (run `import nltk; nltk.download("punkt")` once if needed).
+Sentence splitting prefers blingfire (compiled FST segmenter, orders of
+magnitude faster than NLTK Punkt on long documents), then falls back to
+NLTK's `sent_tokenize` (needs the 'punkt' resources; run
+`import nltk; nltk.download("punkt")` once if needed), then to a simple
+compiled-regex splitter when neither is installed.
 """
+from itertools import chain
 from typing import Dict, List
+import re
 
-import nltk
-from nltk.tokenize import sent_tokenize
+import numpy as np
 
+from ingestion.cleaner import clean_text
+
+try:
+	from blingfire import text_to_sentences as _bf_text_to_sentences
+except Exception:  # pragma: no cover - optional dependency
+	_bf_text_to_sentences = None
+
+try:
+	import nltk
+	from nltk.tokenize import sent_tokenize
+except Exception:  # pragma: no cover - optional dependency
+	nltk = None  # type: ignore
+	sent_tokenize = None  # type: ignore
+
+
+# Last-resort splitter: break after sentence punctuation followed by an
+# uppercase/digit/quote start. Compiled once at import.
+_SENT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
 
 
 def _ensure_punkt() -> None:
+    if _bf_text_to_sentences is not None or nltk is None:
+        # blingfire or the regex fallback is used; no NLTK resources needed.
+        return
     try:
         nltk.data.find("tokenizers/punkt")
         nltk.data.find("tokenizers/punkt_tab")
@@ -26,6 +51,16 @@ def _ensure_punkt() -> None:
         ) from e
 
 
+def _split_sentences(text: str) -> List[str]:
+	"""Split text into sentences using the fastest available backend."""
+	if _bf_text_to_sentences is not None:
+		return [s for s in _bf_text_to_sentences(text).split("\n") if s.strip()]
+	if sent_tokenize is not None:
+		_ensure_punkt()
+		return [s for s in sent_tokenize(text) if s and s.strip()]
+	return [s for s in _SENT_RE.split(text) if s.strip()]
+
+
 
 def _token_count(s: str) -> int:
 	"""Approximate token count by whitespace splitting."""
@@ -60,71 +95,58 @@ def chunk_text(
 	Notes
 	-----
 	- Chunks never exceed `chunk_size` tokens.
-	- Overlap is enforced between consecutive chunks.
+	- Overlap between consecutive chunks is approximate and lands on
+	  sentence boundaries (except for single over-long sentences).
 	- Very short empty chunks are skipped; short documents still yield one chunk.
 	"""
 	if not text or not text.strip():
 		return []
 
-	_ensure_punkt()
-
-	sentences = [s for s in sent_tokenize(text) if s and s.strip()]
+	sentences = _split_sentences(text)
 	if not sentences:
 		# Fallback: treat whole text as one chunk if tokenizer yields nothing
 		sentences = [text.strip()]
 
-	chunks_tokens: List[List[str]] = []
-	current: List[str] = []
-
-	def finalize_current():
-		nonlocal current
-		if current:
-			chunks_tokens.append(current[:])
-			current = []
-
 	# Bound overlap to be less than chunk_size to avoid zero/negative stride
 	overlap = max(0, min(overlap, max(0, chunk_size - 1)))
 
-	for s in sentences:
-		sent_tokens = s.split()
-		if not sent_tokens:
-			continue
+	sent_tokens = [t for t in (s.split() for s in sentences) if t]
+	if not sent_tokens:
+		return []
+
+	# Per-sentence token counts; chunk boundaries come from cumulative sums
+	# instead of per-sentence list bookkeeping.
+	counts = np.fromiter(
+		(len(t) for t in sent_tokens), dtype=np.int64, count=len(sent_tokens)
+	)
 
-		# If a single sentence is longer than chunk_size, split it into blocks
-		if len(sent_tokens) > chunk_size:
-			# Flush any current content first
-			finalize_current()
+	chunks_tokens: List[List[str]] = []
+	n = len(counts)
+	start = 0
+	while start < n:
+		# A single sentence longer than chunk_size is sliced into blocks.
+		if counts[start] > chunk_size:
+			toks = sent_tokens[start]
 			stride = max(1, chunk_size - overlap)
-			j = 0
-			while j < len(sent_tokens):
-				block = sent_tokens[j:j + chunk_size]
+			for j in range(0, len(toks), stride):
+				block = toks[j:j + chunk_size]
 				if block:
 					chunks_tokens.append(block)
-				j += stride
-			# Seed the next chunk with overlap from the last block
-			if chunks_tokens:
-				last = chunks_tokens[-1]
-				current = last[-min(overlap, len(last)) :]
+			start += 1
 			continue
 
-		# Normal sentence handling
-		if len(current) + len(sent_tokens) <= chunk_size:
-			current.extend(sent_tokens)
-		else:
-			# Finalize current and start a new chunk with overlap, then add sentence
-			prev_tail: List[str] = current[-min(overlap, len(current)) :] if current else []
-			finalize_current()
-			# Adjust effective overlap to ensure sentence fits into new chunk
-			effective_overlap = min(len(prev_tail), max(0, chunk_size - len(sent_tokens)))
-			if effective_overlap > 0:
-				current = prev_tail[-effective_overlap:].copy()
-			else:
-				current = []
-			# Now add sentence (guaranteed to fit)
-			current.extend(sent_tokens)
-
-	# Finalize any remaining tokens
-	finalize_current()
+		# Largest end such that the sentences [start, end) fit the budget.
+		cum = counts[start:].cumsum()
+		end = start + int(np.searchsorted(cum, chunk_size, side="right"))
+		chunks_tokens.append(list(chain.from_iterable(sent_tokens[start:end])))
+		if end >= n:
+			break
+
+		# Step back so roughly `overlap` trailing tokens repeat in the next
+		# chunk: smallest restart whose tail sum is <= overlap.
+		total = int(cum[end - start - 1])
+		rel = int(np.searchsorted(cum, total - overlap, side="left"))
+		start = min(end, start + rel + 1)
 
 	# Filter empty and extremely short chunks, but keep single short doc chunk
 	MIN_TOKENS = 5
@@ -133,7 +155,8 @@ def chunk_text(
 		if not chunks_tokens:
 			return []
 
-	# Materialize dicts
+	# Materialize dicts; n_tokens is cached here so downstream context
+	# assembly does not have to re-split the text per query.
 	out: List[Dict[str, str]] = []
 	for i, toks in enumerate(chunks_tokens):
 		if not toks:
@@ -145,7 +168,32 @@ def chunk_text(
 			"chunk_id": f"{document_id}_{i}",
 			"document_id": document_id,
 			"text": text_chunk,
+			"n_tokens": len(toks),
 		})
 
 	return out
 
+
+def chunk_document(doc: Dict[str, str]) -> List[Dict[str, str]]:
+	"""Clean and chunk one loaded document entry.
+
+	PDF pages are already short, so they get smaller chunks with tighter
+	overlap than whole text files. Lives at module level (rather than in
+	the app) so worker pools can pickle it by reference under the spawn
+	start method.
+
+	Parameters
+	----------
+	doc : Dict[str, str]
+		A loader entry with {"document_id", "text"}.
+
+	Returns
+	-------
+	List[Dict[str, str]]
+		Chunk dicts as produced by `chunk_text`.
+	"""
+	text = clean_text(doc["text"])
+	doc_id = doc["document_id"]
+	if ".pdf_page_" in doc_id.lower():
+		return chunk_text(text, doc_id, chunk_size=180, overlap=60)
+	return chunk_text(text, doc_id, chunk_size=280, overlap=80)
@@ -9,14 +9,27 @@ from typing import Optional
 import re
 
 
+# Small table mapping ASCII whitespace controls to a plain space; the
+# non-ASCII strip (e.g. \u2028) stays on the C-level ascii encode/decode
+# path, which needs no table over the whole Unicode range.
+_TRANS = str.maketrans({c: " " for c in "\t\n\r\v\f"})
+
+# Compiled once at import; after translate only runs of spaces can remain.
+_WS_RE = re.compile(r" {2,}")
+
+# Trailing sections to drop (searched on the casefolded text).
+_TRAILER_RE = re.compile(r"\b(references|bibliography)\b")
+
+
 def clean_text(text: Optional[str]) -> str:
 	"""Clean raw text by applying minimal, safe normalization.
 
 	Operations performed (in order):
 	- If input is None or empty, return an empty string.
-	- Normalize line endings and whitespace by collapsing any sequence of
-	  whitespace (spaces, tabs, newlines) into a single space.
-	- Remove non-ASCII characters.
+	- Remove non-ASCII characters (C-level ascii encode/decode) and map
+	  tabs/newlines to spaces with a small `str.translate` table.
+	- Collapse any remaining runs of spaces into a single space.
+	- Drop trailing references/bibliography sections.
 	- Strip leading and trailing whitespace.
 
 	Notes
@@ -37,18 +50,11 @@ def clean_text(text: Optional[str]) -> str:
 	if not text:
 		return ""
 
-	# Remove non-ASCII characters by encoding/decoding.
-	# This safely strips characters like \u2028 without altering casing/punctuation.
-	ascii_text = text.encode("ascii", errors="ignore").decode("ascii")
+	ascii_text = text.encode("ascii", "ignore").decode("ascii")
+	normalized = _WS_RE.sub(" ", ascii_text.translate(_TRANS))
 
-	# Collapse any whitespace (spaces, tabs, newlines) to a single space.
-	normalized = re.sub(r"\s+", " ", ascii_text)
-	lower = normalized.lower()
-	for marker in ["references", "bibliography"]:
-		idx = lower.find(marker)
-		if idx != -1:
-			normalized = normalized[:idx].strip()
-			break
+	match = _TRAILER_RE.search(normalized.casefold())
+	if match:
+		normalized = normalized[: match.start()]
 
 	return normalized.strip()
-
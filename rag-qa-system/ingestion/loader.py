@@ -13,11 +13,21 @@ Notes:
 - Unsupported file types are skipped silently.
 - Raises FileNotFoundError if the provided directory does not exist.
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
+import asyncio
+import os
+import tempfile
 
 import fitz  # PyMuPDF
 
+try:
+	import aiofiles
+except Exception:  # pragma: no cover - optional dependency
+	aiofiles = None  # type: ignore
+
 
 def _load_txt(path: Path) -> str:
 	"""Load a UTF-8 text file and return its contents as a string."""
@@ -25,6 +35,43 @@ def _load_txt(path: Path) -> str:
 		return f.read().strip()
 
 
+_TMP_ROOT = os.path.realpath(tempfile.gettempdir())
+
+
+@lru_cache(maxsize=64)
+def _open_pdf(path_str: str, mtime_ns: int) -> "fitz.Document":
+	"""Open a PDF from an in-memory bytes buffer, cached on path + mtime.
+
+	Opening by path re-parses the XREF table on every call; caching the
+	parsed Document skips that when the same file is loaded again (e.g.
+	ingestion followed by evaluation). The single read_bytes goes through
+	the OS page cache, and the mtime key invalidates stale entries when
+	the file changes.
+	"""
+	data = Path(path_str).read_bytes()
+	return fitz.open(stream=data, filetype="pdf")
+
+
+def _extract_pages(doc: "fitz.Document", name: str) -> List[Dict[str, str]]:
+	"""Extract per-page entries from an open PyMuPDF document."""
+	entries: List[Dict[str, str]] = []
+	for i in range(doc.page_count):
+		page = doc.load_page(i)
+		# "blocks" skips the reading-order reflow that "text" performs;
+		# block type 0 is text (type 1 is images).
+		blocks = page.get_text(
+			"blocks", sort=False, flags=fitz.TEXT_PRESERVE_WHITESPACE
+		)
+		text = "\n".join(b[4] for b in blocks if b[6] == 0).strip()
+		if not text or len(text) < 50:
+			continue
+		entries.append({
+			"document_id": f"{name}_page_{i+1}",
+			"text": text,
+		})
+	return entries
+
+
 def _load_pdf_pages(path: Path) -> List[Dict[str, str]]:
 	"""Load a PDF and return one document entry per page.
 
@@ -32,18 +79,48 @@ def _load_pdf_pages(path: Path) -> List[Dict[str, str]]:
 	- document_id: "<filename>_page_<n>" (1-based page number)
 	- text: extracted page text (skips empty pages)
 	"""
-	entries: List[Dict[str, str]] = []
-	with fitz.open(str(path)) as doc:
-		for i in range(doc.page_count):
-			page = doc.load_page(i)
-			text = (page.get_text("text") or "").strip()
-			if not text or len(text) < 50:
-				continue
-			entries.append({
-				"document_id": f"{path.name}_page_{i+1}",
-				"text": text,
-			})
-	return entries
+	# Uploads are staged into a fresh temp dir per run, so cached handles
+	# for temp paths can never hit again and would only pin dead PDFs in
+	# a long-running server; bypass the cache and close those promptly.
+	# The cache pays off for stable corpus paths (run_pipeline's
+	# data/raw_docs).
+	if os.path.realpath(str(path)).startswith(_TMP_ROOT + os.sep):
+		with fitz.open(str(path)) as doc:
+			return _extract_pages(doc, path.name)
+	# The Document is owned by the _open_pdf cache; do not close it here.
+	doc = _open_pdf(str(path), path.stat().st_mtime_ns)
+	return _extract_pages(doc, path.name)
+
+
+def _load_file(path: Path) -> List[Dict[str, str]]:
+	"""Load one file into document entries; unsupported types yield []."""
+	suffix = path.suffix.lower()
+	if suffix == ".txt":
+		return [{
+			"document_id": path.name,
+			"text": _load_txt(path),
+		}]
+	if suffix == ".pdf":
+		return _load_pdf_pages(path)
+	# Unsupported type: skip silently
+	return []
+
+
+def _list_files(data_dir: str) -> List[Path]:
+	"""List regular files in a directory, sorted by name.
+
+	os.scandir surfaces file-type info from the directory read itself, so
+	no per-entry stat() syscall is needed (iterdir + is_file costs one
+	each); sorting by name afterwards keeps deterministic order.
+	"""
+	root = Path(data_dir)
+	if not root.exists() or not root.is_dir():
+		raise FileNotFoundError(f"Directory not found or not a directory: {data_dir}")
+	with os.scandir(root) as it:
+		names = sorted(
+			e.name for e in it if e.is_file(follow_symlinks=False)
+		)
+	return [root / name for name in names]
 
 
 def load_documents(data_dir: str) -> List[Dict[str, str]]:
@@ -69,28 +146,78 @@ def load_documents(data_dir: str) -> List[Dict[str, str]]:
 	FileNotFoundError
 		If the provided directory does not exist or is not a directory.
 	"""
-	root = Path(data_dir)
-	if not root.exists() or not root.is_dir():
-		raise FileNotFoundError(f"Directory not found or not a directory: {data_dir}")
+	files = _list_files(data_dir)
 
 	entries: List[Dict[str, str]] = []
-	for p in sorted(root.iterdir()):
-		if not p.is_file():
-			continue
+	if len(files) > 1:
+		# File I/O and PDF parsing release the GIL, so extraction is
+		# parallelized per file (each worker owns its own fitz.Document —
+		# PyMuPDF documents must not be shared across threads).
+		workers = min(os.cpu_count() or 1, len(files))
+		with ThreadPoolExecutor(max_workers=workers) as ex:
+			for file_entries in ex.map(_load_file, files):
+				entries.extend(file_entries)
+	else:
+		for p in files:
+			entries.extend(_load_file(p))
+
+	return entries
+
 
-		suffix = p.suffix.lower()
+async def _load_txt_async(path: Path) -> str:
+	"""Load a UTF-8 text file without blocking the event loop.
+
+	Uses aiofiles when installed; otherwise the blocking read runs in the
+	default executor so the loop stays responsive either way.
+	"""
+	if aiofiles is None:
+		return await asyncio.get_running_loop().run_in_executor(
+			None, _load_txt, path
+		)
+	async with aiofiles.open(
+		str(path), "r", encoding="utf-8", errors="ignore"
+	) as f:
+		return (await f.read()).strip()
+
+
+async def load_documents_async(data_dir: str) -> List[Dict[str, str]]:
+	"""Async variant of `load_documents` that overlaps I/O across files.
+
+	All TXT reads are issued concurrently (aiofiles when available), so
+	read latency on slow storage is hidden behind other files' work; PDF
+	extraction is CPU-bound C code and runs in the default executor's
+	thread pool instead. Output is identical to `load_documents`.
+
+	Parameters
+	----------
+	data_dir : str
+		Path to the directory containing raw documents.
+
+	Returns
+	-------
+	List[Dict[str, str]]
+		Same entries as `load_documents`, in the same (name-sorted) order.
+
+	Raises
+	------
+	FileNotFoundError
+		If the provided directory does not exist or is not a directory.
+	"""
+	files = _list_files(data_dir)
+	loop = asyncio.get_running_loop()
+
+	async def load_one(path: Path) -> List[Dict[str, str]]:
+		suffix = path.suffix.lower()
 		if suffix == ".txt":
-			text = _load_txt(p)
-			entries.append({
-				"document_id": p.name,
-				"text": text,
-			})
-		elif suffix == ".pdf":
-			page_entries = _load_pdf_pages(p)
-			entries.extend(page_entries)
-		else:
-			# Unsupported type: skip silently
-			continue
+			return [{
+				"document_id": path.name,
+				"text": await _load_txt_async(path),
+			}]
+		if suffix == ".pdf":
+			return await loop.run_in_executor(None, _load_pdf_pages, path)
+		return []
 
+	entries: List[Dict[str, str]] = []
+	for file_entries in await asyncio.gather(*(load_one(p) for p in files)):
+		entries.extend(file_entries)
 	return entries
-
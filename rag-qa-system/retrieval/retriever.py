@@ -4,7 +4,9 @@ Retrieval utilities for the RAG QA system.
 Implements a simple function to embed a query, search a FAISS index built on
 L2-normalized chunk embeddings, and return the top matching chunks.
 """
+from functools import lru_cache
 from typing import Dict, List
+import os
 
 import numpy as np
 import faiss
@@ -13,13 +15,19 @@ from embeddings.embedder import embed_texts
 from vector_store.faiss_index import search_index
 
 
-def _l2_normalize(x: np.ndarray, eps: float = 1e-12) -> np.ndarray:
-	"""L2-normalize rows of a 2D array, safely handling zeros."""
-	if x.ndim == 1:
-		x = x.reshape(1, -1)
-	norms = np.linalg.norm(x, axis=1, keepdims=True)
-	norms = np.maximum(norms, eps)
-	return x / norms
+# embed_texts returns unit-length vectors by contract; set
+# RAG_DEBUG_CHECK_NORM=1 to verify that at query time.
+_DEBUG_CHECK_NORM = os.getenv("RAG_DEBUG_CHECK_NORM") == "1"
+
+
+@lru_cache(maxsize=4096)
+def _embed_query_cached(normalized_query: str) -> np.ndarray:
+	"""Embed a query string, cached on its stripped, lowercased form.
+
+	The MiniLM tokenizer is uncased, so lowercasing does not change the
+	embedding; repeat queries skip the encoder forward pass entirely.
+	"""
+	return embed_texts([normalized_query], batch_size=1)
 
 
 def retrieve_chunks(
@@ -69,25 +77,136 @@ def retrieve_chunks(
 			f"Index/chunks size mismatch: index.ntotal={ntotal}, len(chunks)={len(chunks)}"
 		)
 
-	# Embed and L2-normalize the query for cosine via inner product
-	q_vec = embed_texts([query], batch_size=1)
-	q_vec = _l2_normalize(q_vec)
+	# Embed (cached for repeat queries); embed_texts already L2-normalizes,
+	# so inner product equals cosine without a second pass.
+	q_vec = _embed_query_cached(query.strip().lower())
+	if _DEBUG_CHECK_NORM:
+		assert np.allclose(np.linalg.norm(q_vec, axis=1), 1.0, atol=1e-4)
 
 	# Search the index
 	scores, inds = search_index(index, q_vec, top_k=top_k)
 	scores = scores[0]
 	inds = inds[0]
 
-	# Map indices back to chunks; filter invalid indices (-1) if any
-	results: List[Dict[str, str]] = []
-	for idx, score in zip(inds.tolist(), scores.tolist()):
-		if idx is None or idx < 0 or idx >= len(chunks):
-			continue
-		item = dict(chunks[idx])
-		item["score"] = float(score)
-		results.append(item)
-
-	# Ensure descending by score (FAISS typically returns sorted, but be explicit)
-	results.sort(key=lambda d: d.get("score", 0.0), reverse=True)
+	# Map indices back to chunks. Padding entries (-1) are masked out in
+	# one vectorized pass; FAISS already returns hits sorted descending by
+	# score, so no re-sort is needed.
+	valid = inds >= 0
+	return [
+		{**chunks[i], "score": float(s)}
+		for i, s in zip(inds[valid].tolist(), scores[valid].tolist())
+	]
+
+
+def retrieve_chunks_batch(
+	queries: List[str],
+	index: faiss.Index,
+	chunks: List[Dict[str, str]],
+	top_k: int = 5,
+) -> List[List[Dict[str, str]]]:
+	"""
+	Retrieve top chunks for many queries with a single FAISS search.
+
+	Embeds all queries in one batch and issues one `index.search` call,
+	amortizing the encoder and FAISS dispatch overhead across queries —
+	useful for evaluation harnesses.
+
+	Parameters
+	----------
+	queries : List[str]
+		Query strings; empty/blank queries yield empty result lists.
+	index : faiss.Index
+		FAISS index built on L2-normalized chunk embeddings.
+	chunks : List[Dict[str, str]]
+		Chunk metadata aligned with the index (see `retrieve_chunks`).
+	top_k : int, optional
+		Number of results per query, by default 5.
+
+	Returns
+	-------
+	List[List[Dict[str, str]]]
+		Per-query result lists, each as in `retrieve_chunks`.
+	"""
+	if index is None:
+		raise ValueError("FAISS index is None.")
+	if not isinstance(chunks, list) or len(chunks) == 0:
+		raise ValueError("Chunks list is empty or invalid.")
+	if not queries:
+		return []
+
+	valid_pos = [i for i, q in enumerate(queries) if q and q.strip()]
+	results: List[List[Dict[str, str]]] = [[] for _ in queries]
+	if not valid_pos:
+		return results
+
+	q_mat = embed_texts(
+		[queries[i] for i in valid_pos], batch_size=max(1, len(valid_pos))
+	)
+	if _DEBUG_CHECK_NORM:
+		assert np.allclose(np.linalg.norm(q_mat, axis=1), 1.0, atol=1e-4)
+
+	scores, inds = search_index(index, q_mat, top_k=top_k)
+	for row, pos in enumerate(valid_pos):
+		valid = inds[row] >= 0
+		results[pos] = [
+			{**chunks[i], "score": float(s)}
+			for i, s in zip(
+				inds[row][valid].tolist(), scores[row][valid].tolist()
+			)
+		]
 	return results
 
+
+def retrieve_chunks_raw(
+	query: str,
+	index: faiss.Index,
+	store,
+	top_k: int = 5,
+):
+	"""Retrieve top chunk indices and scores without materializing dicts.
+
+	Allocation-free companion to `retrieve_chunks` for callers holding a
+	`vector_store.chunk_store.ChunkStore`: results stay as aligned NumPy
+	arrays and `store.to_dicts(inds, scores)` converts at the API edge,
+	so only the rows that actually reach the caller become dicts.
+
+	Parameters
+	----------
+	query : str
+		User query string to embed and search.
+	index : faiss.Index
+		FAISS index built on L2-normalized chunk embeddings.
+	store : ChunkStore
+		Columnar chunk metadata aligned with the index.
+	top_k : int, optional
+		Number of results to return, by default 5.
+
+	Returns
+	-------
+	Tuple[np.ndarray, np.ndarray]
+		`(inds, scores)` 1D arrays sorted by similarity (descending),
+		with FAISS padding entries (-1) removed.
+
+	Raises
+	------
+	ValueError
+		If inputs are invalid (empty store, index/store mismatch).
+	"""
+	if index is None:
+		raise ValueError("FAISS index is None.")
+	if store is None or len(store) == 0:
+		raise ValueError("Chunk store is empty or invalid.")
+	if not query or not query.strip():
+		empty = np.empty(0, dtype=np.int64)
+		return empty, np.empty(0, dtype=np.float32)
+
+	ntotal = getattr(index, "ntotal", None)
+	if ntotal is not None and ntotal != len(store):
+		raise ValueError(
+			f"Index/store size mismatch: index.ntotal={ntotal}, len(store)={len(store)}"
+		)
+
+	q_vec = _embed_query_cached(query.strip().lower())
+	scores, inds = search_index(index, q_vec, top_k=top_k)
+	valid = inds[0] >= 0
+	return inds[0][valid], scores[0][valid]
@@ -1,21 +1,63 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
 from ingestion.loader import load_documents
 from ingestion.cleaner import clean_text
 from ingestion.chunker import chunk_text
 
-from embeddings.embedder import embed_texts
-from vector_store.faiss_index import build_index
-from retrieval.retriever import retrieve_chunks
+from embeddings.embedder import iter_embed_texts
+from vector_store.chunk_store import ChunkStore, from_compact, to_compact
+from vector_store.faiss_index import build_index_streaming, load_index, save_index
+from retrieval.retriever import retrieve_chunks_raw
+from retrieval.reranker import rerank_chunks
 from generation.generator import generate_answer
 
 
-def main():
-    # 1. Load documents
-    docs = load_documents("data/raw_docs")
+DATA_DIR = "data/raw_docs"
+CACHE_DIR = "storage"
+
+# Retrieve-and-rerank: the bi-encoder pulls a wide candidate set cheaply,
+# then the cross-encoder reorders it down to the final answer context.
+# Reranker cost is bounded by the candidate cap, not corpus size.
+RERANK_CANDIDATES = 100
+FINAL_TOP_K = 5
+
+# Bump when the chunking/embedding configuration changes, so stale caches
+# are not reused.
+_PIPELINE_CONFIG = "chunk400-overlap80-minilm-v1"
+
+
+def _cache_key(data_dir: str) -> str:
+    """Hash the corpus file names/mtimes/sizes plus the pipeline config."""
+    h = hashlib.sha1(_PIPELINE_CONFIG.encode())
+    for p in sorted(Path(data_dir).iterdir()):
+        if p.is_file():
+            st = p.stat()
+            h.update(f"{p.name}:{st.st_mtime_ns}:{st.st_size}".encode())
+    return h.hexdigest()[:16]
+
+
+def _build_or_load():
+    """Return (index, chunks), reusing the on-disk cache when fresh."""
+    key = _cache_key(DATA_DIR)
+    index_path = os.path.join(CACHE_DIR, f"pipeline-{key}.faiss")
+    chunks_path = os.path.join(CACHE_DIR, f"pipeline-{key}.chunks.json")
+
+    if os.path.exists(index_path) and os.path.exists(chunks_path):
+        # Cache hit: mmap the index (demand-paged, O(1) startup) and skip
+        # cleaning/chunking/embedding entirely.
+        index = load_index(index_path, mmap=True)
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            chunks = from_compact(json.load(f))
+        print(f"Loaded cached index ({len(chunks)} chunks)")
+        return index, chunks
+
+    docs = load_documents(DATA_DIR)
     if not docs:
-        print("No documents found in data/raw_docs")
-        return
+        return None, []
 
-    # 2. Clean + chunk documents
     chunks = []
     for d in docs:
         text = clean_text(d["text"])
@@ -24,17 +66,36 @@ def main():
         )
 
     if not chunks:
-        print("No chunks created.")
-        return
+        return None, []
 
     print(f"Created {len(chunks)} chunks")
 
-    # 3. Embed chunks
+    # Stream embedding batches straight into the index so only one batch
+    # of vectors is in RAM at a time instead of the full (N, D) matrix.
     chunk_texts = [c["text"] for c in chunks]
-    embeddings = embed_texts(chunk_texts)
+    index = build_index_streaming(iter_embed_texts(chunk_texts))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    save_index(index, index_path)
+    with open(chunks_path, "w", encoding="utf-8") as f:
+        json.dump(to_compact(chunks), f, ensure_ascii=False)
+
+    return index, chunks
+
+
+def main():
+    if not os.path.isdir(DATA_DIR):
+        print(f"No documents found in {DATA_DIR}")
+        return
+
+    index, chunks = _build_or_load()
+    if index is None:
+        print("No chunks created.")
+        return
 
-    # 4. Build FAISS index
-    index = build_index(embeddings)
+    # Columnar view: retrieval works on (indices, scores) arrays and
+    # dicts are materialized only for the candidates handed onwards.
+    store = ChunkStore(chunks)
 
     # 5. Ask questions
     print("\nRAG system ready. Type 'exit' to quit.\n")
@@ -43,12 +104,15 @@ def main():
         if query.lower() in {"exit", "quit"}:
             break
 
-        retrieved = retrieve_chunks(
+        inds, scores = retrieve_chunks_raw(
             query=query,
             index=index,
-            chunks=chunks,
-            top_k=3,
+            store=store,
+            top_k=RERANK_CANDIDATES,
         )
+        retrieved = store.to_dicts(inds, scores)
+        if len(retrieved) > FINAL_TOP_K:
+            retrieved = rerank_chunks(query, retrieved, top_k=FINAL_TOP_K)
 
         answer = generate_answer(query, retrieved)
 
